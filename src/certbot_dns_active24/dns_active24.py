@@ -1,33 +1,118 @@
 """DNS Authenticator for Active24 DNS."""
+import argparse
 import logging
 
 import requests
+import tldextract
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 
-import zope.interface
-from typing import List
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
 
-import dns.query
+import asyncio
+
+import dns.asyncquery
+import dns.asyncresolver
+import dns.flags
+import dns.message
 import dns.resolver
-from dns.exception import DNSException
+import dns.rrset
+from dns.exception import DNSException, Timeout
+
+from concurrent.futures import ThreadPoolExecutor
 
 import hmac
-import hashlib
-from datetime import datetime, timezone
-from time import time, sleep
+from random import uniform
+from threading import Lock
+from time import gmtime, monotonic, strftime, time, time_ns
 
 from acme import challenges
 from certbot import achallenges
 from certbot import errors
-from certbot import interfaces
 from certbot.plugins import dns_common
 from certbot.display import util as display_util
 from requests import Response
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+    import h2  # httpx needs it for HTTP/2 but doesn't depend on it
+except ImportError:
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+# Errors which only postpone a propagation check to the next polling round
+_TRANSIENT_ERRORS = (DNSException, OSError, asyncio.TimeoutError) + ((httpx.HTTPError,) if httpx is not None else ())
+
+# Authoritative nameservers keyed by zone name, along with the time (monotonic) until which they're valid
+_NS_CACHE: Dict[str, Tuple[float, List[str]]] = {}
+
+# Public Suffix List based domain parser; uses the snapshot bundled with tldextract, so it never hits the network
+_tld_extract = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+# Maximum number of challenges whose DNS records are added or removed concurrently
+_MAX_WORKERS = 8
+
+# Delay (in seconds) before the first propagation check
+_INITIAL_POLL_DELAY = 2
+
+# Timeout (in seconds) for a single UDP query to a nameserver
+_DNS_QUERY_TIMEOUT = 2
+
+# Number of consecutive rounds in which the zone doesn't exist after which propagation checks are given up
+_MAX_MISSING_ZONE_ERRORS = 3
+
+# DNS-over-HTTPS resolvers used to check propagation when enabled
+_DOH_RESOLVERS = [
+    'https://dns.google/dns-query',
+    'https://cloudflare-dns.com/dns-query',
+]
+
+# Jitter for the API retry backoff; only supported by urllib3 2.x
+_RETRY_JITTER = {'backoff_jitter': 0.5} if int(urllib3.__version__.split('.')[0]) >= 2 else {}
+
+# Headers sent with every Active24 API request
+_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+}
+
+# How long (in seconds) a DNS record listing fetched from the Active24 API can be reused
+_RECORDS_CACHE_TTL = 30
+
+
+class _PropagationCheck(NamedTuple):
+    """A challenge TXT record to check, along with the zone whose nameservers should serve it"""
+    record: str
+    zone: str
+    query: dns.message.Message
+    doh_query: bytes
+    challenge: bytes
+
+
+class _Retry(Retry):
+    """
+    Retries idempotent requests on transient errors, but non-idempotent ones only when rate limited,
+    since a failed request may still have been committed by the API
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if self.allowed_methods and method.upper() not in self.allowed_methods:
+            return bool(self.total) and status_code == 429
+
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class _ZoneNotFound(DNSException):
+    """The zone whose nameservers should serve the challenge records doesn't exist"""
+
 
-@zope.interface.implementer(interfaces.IAuthenticator)
-@zope.interface.provider(interfaces.IPluginFactory)
 class Authenticator(dns_common.DNSAuthenticator):
     """DNS Authenticator for Active24 DNS
 
@@ -37,13 +122,22 @@ class Authenticator(dns_common.DNSAuthenticator):
     description = 'Obtain certificates using a DNS TXT record (if you are using Active24 for DNS).'
 
     def __init__(self, *args, **kwargs):
-        super(Authenticator, self).__init__(*args, **kwargs)
+        super().__init__(*args, **kwargs)
         self.credentials = None
+        self._client = None
+        self._client_lock = Lock()
 
     @classmethod
     def add_parser_arguments(cls, add):  # pylint: disable=arguments-differ
-        super(Authenticator, cls).add_parser_arguments(add, default_propagation_seconds=300)
+        super().add_parser_arguments(add, default_propagation_seconds=300)
         add('credentials', help='Path to Active24 credentials INI file', default='/etc/letsencrypt/active24.ini')
+        add('initial-poll-interval', type=_positive_float, default=1,
+            help='Number of seconds to wait between the first DNS propagation checks')
+        add('max-poll-interval', type=_positive_float, default=15,
+            help='Maximum number of seconds to wait between DNS propagation checks')
+        add('doh', action='store_true', default=False,
+            help='Check DNS propagation using public DNS-over-HTTPS resolvers instead of '
+                 'querying the authoritative nameservers directly')
 
     def more_info(self):  # pylint: disable=missing-docstring,no-self-use
         return 'This plugin configures a DNS TXT record to respond to a dns-01 challenge using ' + \
@@ -53,16 +147,27 @@ class Authenticator(dns_common.DNSAuthenticator):
                 ) -> List[challenges.ChallengeResponse]: # pylint: disable=missing-function-docstring
         self._setup_credentials()
 
+        # renewal configuration doesn't necessarily go through the argument parser, so check again
+        if not 0 < self.conf('initial-poll-interval') <= self.conf('max-poll-interval'):
+            raise errors.PluginError('The initial poll interval must be a positive number '
+                                     'no greater than the maximum poll interval.')
+
+        if self.conf('doh') and httpx is None:
+            raise errors.PluginError('Checking DNS propagation over HTTPS requires the httpx and h2 packages, '
+                                     'install certbot-dns-active24[doh] to enable it.')
+
         self._attempt_cleanup = True
 
-        responses = []
-        for achall in achalls:
-            domain = achall.domain
-            validation_domain_name = achall.validation_domain_name(domain)
-            validation = achall.validation(achall.account_key)
+        checks = _prepare_propagation_checks(achalls)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # discover the nameservers to poll while the records are being created
+            if not self.conf('doh'):
+                executor.submit(asyncio.run, _prime_nameservers(checks))
+
+            self._for_each_challenge(achalls, self._perform)
 
-            self._perform(domain, validation_domain_name, validation)
-            responses.append(achall.response(achall.account_key))
+        responses = [achall.response(achall.account_key) for achall in achalls]
 
         propagation_delay = self.conf('propagation-seconds')
 
@@ -73,14 +178,46 @@ class Authenticator(dns_common.DNSAuthenticator):
             display_util.notify(f'Waiting for DNS changes to propagate')
             wait_until = time() + 3600
 
-        while time() < wait_until:
-            if _all_challenges_propagated(achalls):
-                break
-            sleep(5)
+        try:
+            asyncio.run(_wait_for_propagation(
+                checks,
+                wait_until,
+                self.conf('initial-poll-interval'),
+                self.conf('max-poll-interval'),
+                self.conf('doh'),
+            ))
+        finally:
+            # delegations may change before the next run, don't let them outlive this one
+            _NS_CACHE.clear()
 
         return responses
 
+    def cleanup(self, achalls: List[achallenges.AnnotatedChallenge]) -> None:  # pylint: disable=missing-function-docstring
+        if not self._attempt_cleanup:
+            return
+
+        try:
+            self._for_each_challenge(achalls, self._cleanup)
+        finally:
+            self._close_active24_client()
+
+    def _for_each_challenge(self, achalls, callback):
+        """
+        Invoke callback(domain, validation_name, validation) for each challenge concurrently.
+        :raises Exception: the first exception raised by any of the callback invocations
+        """
+
+        with ThreadPoolExecutor(max_workers=max(1, min(_MAX_WORKERS, len(achalls)))) as executor:
+            list(executor.map(lambda achall: callback(
+                achall.domain,
+                achall.validation_domain_name(achall.domain),
+                achall.validation(achall.account_key),
+            ), achalls))
+
     def _setup_credentials(self):
+        # a client created with previously loaded credentials must not be reused
+        self._close_active24_client()
+
         self.credentials = self._configure_credentials(
             'credentials',
             'Path to Active24 credentials INI file',
@@ -97,7 +234,17 @@ class Authenticator(dns_common.DNSAuthenticator):
         self._get_active24_client().del_txt_record(validation_name, validation)
 
     def _get_active24_client(self):
-        return _Active24Client(self.credentials.conf('api_key'), self.credentials.conf('secret'))
+        with self._client_lock:
+            if self._client is None:
+                self._client = _Active24Client(self.credentials.conf('api_key'), self.credentials.conf('secret'))
+
+            return self._client
+
+    def _close_active24_client(self):
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
 
 class _Active24Client(object):
@@ -108,7 +255,34 @@ class _Active24Client(object):
     def __init__(self, api_key, secret):
         self.api_key = api_key
         self.secret = secret
+        self._secret_bytes = secret.encode('utf-8')
         self.test = False
+        self._base_url = 'https://rest.active24.cz'
+        self._service_cache = {}
+        self._service_lock = Lock()
+        self._records_cache = {}
+
+        self._session = requests.Session()
+        self._session.headers.update(_HEADERS)
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=_MAX_WORKERS,
+            pool_maxsize=_MAX_WORKERS,
+            max_retries=_Retry(
+                total=5,
+                backoff_factor=0.5,
+                **_RETRY_JITTER,
+                respect_retry_after_header=True,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({'GET', 'DELETE'}),
+                raise_on_status=False,
+            ),
+        ))
+
+    def close(self):
+        """
+        Close the underlying HTTP session and release any pooled connections.
+        """
+        self._session.close()
 
     def add_txt_record(self, record_name, record_content):
         """
@@ -118,7 +292,7 @@ class _Active24Client(object):
         :raises certbot.errors.PluginError: if an error occurs communicating with the Active24 API
         """
 
-        domain, record = self._parse_domain(record_name)
+        domain, record = _parse_domain(record_name)
         logger.debug('Attempting to add record %s with content %s' % (record, record_content))
 
         try:
@@ -142,6 +316,7 @@ class _Active24Client(object):
             logger.error('Encountered error adding TXT record: %s' % response)
             raise errors.PluginError('Error communicating with the Active24 API: %s' % response)
 
+        self._invalidate_records(service)
         logger.debug('Successfully added TXT record')
 
     def del_txt_record(self, record_name, record_content):
@@ -154,7 +329,7 @@ class _Active24Client(object):
         :param str record_content: The record content (typically the challenge validation).
         """
 
-        domain, record = self._parse_domain(record_name)
+        domain, record = _parse_domain(record_name)
         logger.debug('Attempting to delete record: %s' % record)
         service = self._find_service(domain)
         dns_record = self._find_record(service, record_name, record_content)
@@ -173,56 +348,69 @@ class _Active24Client(object):
             logger.warning('Encountered error deleting TXT record: %s' % response)
             return
 
+        self._forget_record(service, record_name, record_content)
         logger.debug('Successfully deleted TXT record.')
 
     def _find_service(self, domain_name):
-        response = self._send_request('GET', '/v1/user/self/service')
-        payload = response.json()
+        # challenges are processed concurrently; make sure only one of them fetches the service listing
+        with self._service_lock:
+            if domain_name not in self._service_cache:
+                response = self._send_request('GET', '/v1/user/self/service')
+                payload = _decode_json(response)
 
-        for service in payload['items']:
-            if service['serviceName'] == 'domain' and service['name'] == domain_name:
-                return service['id']
+                for service in payload['items']:
+                    if service['serviceName'] == 'domain':
+                        self._service_cache[service['name']] = service['id']
 
-        return None
+            return self._service_cache.get(domain_name)
 
     def _find_record(self, service, record_name, record_content):
-        response = self._send_request('GET', '/v2/service/%d/dns/record' % service, query={
-            'name': record_name,
-            'type': ['TXT'],
-        })
-        payload = response.json()
+        key = (service, record_name)
+        cached = self._records_cache.get(key)
 
-        for record in payload['data']:
-            if record['type'] == 'TXT' and record['name'] == record_name and record['content'] == record_content:
-                return record
+        if cached is None or cached[0] <= monotonic():
+            response = self._send_request('GET', '/v2/service/%d/dns/record' % service, query={
+                'name': record_name,
+                'type': ['TXT'],
+            })
+            payload = _decode_json(response)
+            index = {
+                (record['name'], record['content']): record
+                for record in payload['data'] if record['type'] == 'TXT'
+            }
+            cached = self._records_cache[key] = (monotonic() + _RECORDS_CACHE_TTL, index)
 
-        return None
+        return cached[1].get((record_name, record_content))
 
-    def _parse_domain(self, domain):
-        """
-        Parses full domain into base domain name and record name
-        :param str domain: Domain name
-        :returns: Top-level
-        :rtype: tuple
-        """
-        pieces = domain.split('.')
-        return '.'.join(pieces[-2:]), '.'.join(pieces[:-2])
+    def _invalidate_records(self, service):
+        for key in [key for key in self._records_cache if key[0] == service]:
+            del self._records_cache[key]
+
+    def _forget_record(self, service, record_name, record_content):
+        cached = self._records_cache.get((service, record_name))
+
+        if cached is not None:
+            cached[1].pop((record_name, record_content), None)
 
     def _send_request(self, method, path, payload=None, query=None) -> Response:
-        base_url = 'https://rest.active24.cz'
-        timestamp = int(time())
-        request = "%s %s %s" % (method, path, timestamp)
-        signature = hmac.new(bytes(self.secret, 'UTF-8'), bytes(request, 'UTF-8'), hashlib.sha1).hexdigest()
+        timestamp = time_ns() // 10**9
+        request = b'%s %s %d' % (method.encode(), path.encode(), timestamp)
+        signature = hmac.digest(self._secret_bytes, request, 'sha1').hex()
 
-        response = requests.request(
+        data = None
+
+        if payload is not None and orjson is not None:
+            data = orjson.dumps(payload)
+            payload = None
+
+        response = self._session.request(
             method,
-            base_url + path,
+            self._base_url + path,
+            data=data,
             json=payload,
             params=query,
             headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Date": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "Date": strftime('%Y-%m-%dT%H:%M:%S+00:00', gmtime(timestamp)),
             },
             auth=(
                 self.api_key,
@@ -234,37 +422,227 @@ class _Active24Client(object):
         return response
 
 
-def _all_challenges_propagated(achalls: List[achallenges.AnnotatedChallenge]) -> bool:
-    for achall in achalls:
-        try:
-            if not _has_propagated(achall.validation_domain_name(achall.domain),
-                                   achall.validation(achall.account_key)):
-                return False
-        except:
-            return False
+def _positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{value} is not a number')
 
-    return True
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive number')
 
-def _has_propagated(record: str, challenge: str) -> bool:
-    nameservers = _resolve_authoritative_nameservers(record)
-    query = dns.message.make_query(record, dns.rdatatype.TXT)
+    return number
 
-    for ns in nameservers:
-        response = dns.query.udp(query, ns)
-        rcode = response.rcode()
+def _parse_domain(domain: str) -> Tuple[str, str]:
+    """
+    Parses full domain into base domain name and record name
+    :param str domain: Domain name
+    :returns: Registered domain (according to the Public Suffix List) and record name
+    :rtype: tuple
+    """
+    parts = _tld_extract(domain)
 
-        if rcode != dns.rcode.NOERROR:
-            return False
+    if not parts.domain or not parts.suffix:
+        return domain, ''
 
-        for rrset in response.answer:
-            for rr in rrset:
-                if rr.rdtype == dns.rdatatype.TXT and rr.to_text().strip('"') != challenge:
-                    return False
+    return f'{parts.domain}.{parts.suffix}', parts.subdomain
+
+def _decode_json(response: Response):
+    if orjson is not None:
+        return orjson.loads(response.content)
+
+    return response.json()
 
-    return True
+def _prepare_propagation_checks(achalls: List[achallenges.AnnotatedChallenge]) -> List[_PropagationCheck]:
+    queries = {}
+    doh_queries = {}
+    checks = []
 
-def _resolve_authoritative_nameservers(domain: str) -> List[str]:
-    default = dns.resolver.get_default_resolver()
+    for achall in achalls:
+        record = achall.validation_domain_name(achall.domain)
+
+        if record not in queries:
+            # the queries go straight to the authoritative nameservers, so there's no need for recursion
+            query = dns.message.make_query(record, dns.rdatatype.TXT, use_edns=False)
+            query.flags &= ~dns.flags.RD
+            queries[record] = query
+
+            # RFC 8484 recommends a zero ID so that identical queries can be cached by HTTP caches
+            doh_query = dns.message.make_query(record, dns.rdatatype.TXT)
+            doh_query.id = 0
+            doh_queries[record] = doh_query.to_wire()
+
+        checks.append(_PropagationCheck(
+            record,
+            _parse_domain(record)[0],
+            queries[record],
+            doh_queries[record],
+            achall.validation(achall.account_key).encode(),
+        ))
+
+    return checks
+
+async def _wait_for_propagation(checks: List[_PropagationCheck], wait_until: float,
+                                initial_interval: float, max_interval: float, use_doh: bool = False) -> None:
+    if use_doh:
+        async with httpx.AsyncClient(http2=True, timeout=_DNS_QUERY_TIMEOUT) as client:
+            await _poll(lambda: _check_all_challenges_doh(client, checks), wait_until, initial_interval, max_interval)
+    else:
+        await _poll(lambda: _check_all_challenges(checks), wait_until, initial_interval, max_interval)
+
+async def _poll(check: Callable[[], Awaitable[bool]], wait_until: float,
+                initial_interval: float, max_interval: float) -> None:
+    # give the nameservers a moment before the first query so that resolvers don't cache a negative answer
+    await asyncio.sleep(_INITIAL_POLL_DELAY)
+
+    interval = initial_interval
+    missing_zone_errors = 0
+
+    while time() < wait_until:
+        try:
+            if await check():
+                return
+
+            missing_zone_errors = 0
+        except _ZoneNotFound as e:
+            # the zone itself doesn't resolve; retry briefly in case of a glitch, but don't wait it out
+            missing_zone_errors += 1
+
+            if missing_zone_errors >= _MAX_MISSING_ZONE_ERRORS:
+                raise errors.PluginError(f'Unable to check DNS propagation: {e}') from e
+
+            interval = initial_interval
+        except _TRANSIENT_ERRORS as e:
+            logger.debug('Propagation check failed, retrying: %s', e)
+            missing_zone_errors = 0
+            # errors are usually transient, so start polling eagerly again
+            interval = initial_interval
+
+        await asyncio.sleep(max(0, min(interval * uniform(0.8, 1.2), wait_until - time())))
+        interval = min(interval * 2, max_interval)
+
+async def _check_all_challenges(checks: List[_PropagationCheck]) -> bool:
+    zones = list(dict.fromkeys(check.zone for check in checks))
+    nameservers = dict(zip(zones, await asyncio.gather(*[_get_nameservers(zone) for zone in zones])))
+
+    return await _all_succeed([
+        _check_nameserver(ns, check.query, check.challenge)
+        for check in checks
+        for ns in nameservers[check.zone]
+    ])
+
+async def _check_all_challenges_doh(client: 'httpx.AsyncClient', checks: List[_PropagationCheck]) -> bool:
+    # public resolvers may be served by different caches, so all of them have to agree
+    return await _all_succeed([
+        _check_doh_resolver(client, url, check.doh_query, check.challenge)
+        for check in checks
+        for url in _DOH_RESOLVERS
+    ])
+
+async def _prime_nameservers(checks: List[_PropagationCheck]) -> None:
+    zones = list(dict.fromkeys(check.zone for check in checks))
+    results = await asyncio.gather(*[_get_nameservers(zone) for zone in zones], return_exceptions=True)
+
+    for zone, result in zip(zones, results):
+        if isinstance(result, Exception):
+            # not fatal, the nameservers will be looked up again when polling
+            logger.debug('Failed to discover nameservers for %s: %s', zone, result)
+
+async def _all_succeed(checks: List[Awaitable[bool]]) -> bool:
+    tasks = [asyncio.ensure_future(check) for check in checks]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            if not await task:
+                return False
+
+        return True
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def _check_nameserver(ns: str, query: dns.message.Message, challenge: bytes) -> bool:
+    for _ in range(2):
+        try:
+            response = await dns.asyncquery.udp(query, ns, timeout=_DNS_QUERY_TIMEOUT)
+            break
+        except Timeout:
+            logger.debug('Timed out querying %s for %s', ns, query.question[0].name)
+    else:
+        return False
+
+    return _has_challenge(response, challenge)
+
+async def _check_doh_resolver(client: 'httpx.AsyncClient', url: str, query: bytes, challenge: bytes) -> bool:
+    response = await client.post(url, content=query, headers={
+        'Content-Type': 'application/dns-message',
+        'Accept': 'application/dns-message',
+    })
+    response.raise_for_status()
+
+    return _has_challenge(dns.message.from_wire(response.content), challenge)
+
+def _has_challenge(response: dns.message.Message, challenge: bytes) -> bool:
+    return any(
+        b''.join(rr.strings) == challenge
+        for rrset in response.answer if rrset.rdtype == dns.rdatatype.TXT
+        for rr in rrset
+    )
+
+def _get_resolver() -> dns.asyncresolver.Resolver:
+    resolver = dns.asyncresolver.get_default_resolver()
+
+    if resolver.cache is None:
+        resolver.cache = dns.resolver.LRUCache(max_size=1024)
+
+    return resolver
+
+async def _get_nameservers(domain: str) -> List[str]:
+    parts = domain.lower().split('.')
+    now = monotonic()
+
+    for i in range(len(parts)):
+        cached = _NS_CACHE.get('.'.join(parts[i:]))
+
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+    zone, ttl, nameservers = await _resolve_authoritative_nameservers(domain)
+    _NS_CACHE[zone] = (now + ttl, nameservers)
+    return nameservers
+
+async def _resolve_authoritative_nameservers(domain: str) -> Tuple[str, int, List[str]]:
+    try:
+        answer = await _get_resolver().resolve(domain, dns.rdatatype.NS)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        # the recursive resolver doesn't know the delegation (yet), so walk the hierarchy ourselves
+        return await _trace_authoritative_nameservers(domain)
+
+    return (
+        answer.rrset.name.to_text(omit_final_dot=True).lower(),
+        answer.rrset.ttl,
+        await _resolve_nameserver_addresses(answer.rrset),
+    )
+
+async def _resolve_nameserver_addresses(rrset: dns.rrset.RRset) -> List[str]:
+    addresses = await asyncio.gather(*[_resolve_nameserver_address(rr.to_text()) for rr in rrset])
+    addresses = [address for address in addresses if address is not None]
+
+    if len(addresses) == 0:
+        raise DNSException(f'None of the nameservers of {rrset.name} can be resolved.')
+
+    return addresses
+
+async def _resolve_nameserver_address(name: str) -> Optional[str]:
+    try:
+        return (await _get_resolver().resolve(name)).rrset[0].to_text()
+    except DNSException as e:
+        # a stale NS record shouldn't prevent checking the remaining nameservers
+        logger.debug('Skipping nameserver %s which cannot be resolved: %s', name, e)
+        return None
+
+async def _trace_authoritative_nameservers(domain: str) -> Tuple[str, int, List[str]]:
+    default = _get_resolver()
     ns = default.nameservers[0]
     parts = domain.split('.')
     result = list()
@@ -272,12 +650,12 @@ def _resolve_authoritative_nameservers(domain: str) -> List[str]:
     for i in range(len(parts), 0, -1):
         sub = '.'.join(parts[i-1:])
         query = dns.message.make_query(sub, dns.rdatatype.NS)
-        response = dns.query.udp(query, ns)
+        response = await dns.asyncquery.udp(query, ns, timeout=_DNS_QUERY_TIMEOUT)
         rcode = response.rcode()
 
         if rcode != dns.rcode.NOERROR:
             if rcode == dns.rcode.NXDOMAIN:
-                raise DNSException(f'{sub} does not exist.')
+                raise _ZoneNotFound(f'{sub} does not exist.')
             else:
                 raise DNSException(f'Error {dns.rcode.to_text(rcode)}')
 
@@ -293,7 +671,14 @@ def _resolve_authoritative_nameservers(domain: str) -> List[str]:
                 if rr.rdtype == dns.rdatatype.A:
                     ns = rr.items[0].address
                 elif rr.rdtype == dns.rdatatype.NS:
-                    ns = default.resolve(rr.to_text()).rrset[0].to_text()
+                    ns = await _resolve_nameserver_address(rr.to_text()) or ns
                     result = rrset
 
-    return [default.resolve(rr.to_text()).rrset[0].to_text() for rr in result]
+    if len(result) == 0:
+        raise DNSException(f'No authoritative nameservers found for {domain}.')
+
+    return (
+        result.name.to_text(omit_final_dot=True).lower(),
+        result.ttl,
+        await _resolve_nameserver_addresses(result),
+    )